@@ -28,8 +28,9 @@ import os
 import json
 import time
 import logging
-import subprocess
 import threading
+import http.client
+from urllib.parse import urlsplit
 from datetime import datetime
 
 try:
@@ -48,6 +49,8 @@ DEAUTH_ALLOW = "/etc/pwnagotchi/allow_deauth"
 DEAUTH_TOKEN = "/etc/pwnagotchi/deauth_token"
 DEAUTH_LOG = "/var/log/pwnagotchi/deauth.log"
 AGENT_HTTP = "http://127.0.0.1:8422/deauth"   # optional local agent endpoint
+_AGENT = urlsplit(AGENT_HTTP)
+AGENT_TIMEOUT = 0.3
 
 # UI throttling
 _UPDATE_HZ = 2.0
@@ -73,6 +76,7 @@ class OnscreenMenu(Plugin):
 
     def on_unload(self, ui):
         logging.info("[onscreen_menu] unloading")
+        _close_audit_fd()
 
     def on_ui_setup(self, ui):
         """Called when UI is available. Inject menu and perform layout adjustments."""
@@ -151,11 +155,52 @@ class OnscreenMenu(Plugin):
             logging.exception("[onscreen_menu] apply_initial_layout update failed")
 
 # Helper utilities exported for local scripts to reuse -------------------
+_audit_fd = None
+_audit_lock = threading.Lock()   # guards the lazy open/reopen of _audit_fd
+
+def _drop_audit_fd():
+    # caller holds _audit_lock
+    global _audit_fd
+    if _audit_fd is not None:
+        try:
+            os.close(_audit_fd)
+        except OSError:
+            pass
+        _audit_fd = None
+
+def _ensure_audit_fd():
+    """O_APPEND fd for DEAUTH_LOG; reopened after rotation. Caller holds _audit_lock."""
+    global _audit_fd
+    if _audit_fd is not None:
+        try:
+            st = os.stat(DEAUTH_LOG)
+            cur = os.fstat(_audit_fd)
+            if (st.st_dev, st.st_ino) != (cur.st_dev, cur.st_ino):
+                _drop_audit_fd()
+        except OSError:
+            # log renamed/removed, or the fd itself went bad
+            _drop_audit_fd()
+    if _audit_fd is None:
+        os.makedirs(os.path.dirname(DEAUTH_LOG), exist_ok=True)
+        _audit_fd = os.open(DEAUTH_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+    return _audit_fd
+
+def _close_audit_fd():
+    """Release the cached DEAUTH_LOG fd; the next _audit reopens it."""
+    with _audit_lock:
+        _drop_audit_fd()
+
 def _audit(entry):
+    # one O_APPEND write per line: appends don't interleave below PIPE_BUF
+    line = (json.dumps(entry) + "\n").encode()
     try:
-        os.makedirs(os.path.dirname(DEAUTH_LOG), exist_ok=True)
-        with open(DEAUTH_LOG, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        with _audit_lock:
+            try:
+                os.write(_ensure_audit_fd(), line)
+            except OSError:
+                # bad fd (EBADF/EIO, card re-mounted...): reopen once rather than stay broken
+                _drop_audit_fd()
+                os.write(_ensure_audit_fd(), line)
     except Exception:
         logging.exception("_audit failed")
 
@@ -166,17 +211,52 @@ def _permit():
         return False, "token-missing"
     return True, "ok"
 
+_conn = None
+_conn_lock = threading.Lock()   # http.client connections are not thread-safe
+# what a reused keep-alive socket raises once the agent has closed its end
+_STALE_CONN_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+def _reset_conn():
+    global _conn
+    if _conn is not None:
+        _conn.close()
+    _conn = None
+
+def _post_agent(body):
+    """Send one POST on the shared connection (caller holds _conn_lock). Returns the HTTP status."""
+    global _conn
+    if _conn is None:
+        _conn = http.client.HTTPConnection(_AGENT.hostname, _AGENT.port, timeout=AGENT_TIMEOUT)
+    _conn.request("POST", _AGENT.path, body=body, headers={"Content-Type": "application/json"})
+    resp = _conn.getresponse()
+    resp.read()
+    return resp.status
+
 def _notify_agent(action):
-    """Notify a local agent endpoint non-blocking. Returns True if started."""
+    """POST to the local agent over a kept-alive connection. Returns True on a 2xx reply."""
     try:
         if not os.path.exists(DEAUTH_TOKEN):
             return False
         token = open(DEAUTH_TOKEN).read().strip()
         payload = {"action": action, "token": token, "ts": time.time()}
-        subprocess.Popen(["curl", "-s", "-X", "POST", "-H", "Content-Type: application/json",
-                          "-d", json.dumps(payload), AGENT_HTTP],
-                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        body = json.dumps(payload)
+        with _conn_lock:
+            reused = _conn is not None
+            try:
+                status = _post_agent(body)
+            except _STALE_CONN_ERRORS:
+                if not reused:
+                    raise
+                # agent dropped the idle socket; reconnect and resend once
+                _reset_conn()
+                status = _post_agent(body)
+        if not 200 <= status < 300:
+            logging.warning("_notify_agent: agent replied %d", status)
+            return False
         return True
     except Exception:
+        # drop the connection; the next call reconnects
+        with _conn_lock:
+            _reset_conn()
         logging.exception("_notify_agent failed")
         return False
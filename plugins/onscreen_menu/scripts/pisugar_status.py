@@ -1,14 +1,43 @@
 #!/usr/bin/env python3
 # pisugar_status.py
 # Probes PiSugar REST endpoint (127.0.0.1:8421) and prints a short status line.
+# Talks HTTP/1.0 over a plain socket (no curl fork); stops after Content-Length bytes.
 
-import subprocess
+import socket
 import json
 import sys
 
+PISUGAR_HOST = "127.0.0.1"
+PISUGAR_PORT = 8421
+
+def _get_battery():
+    with socket.create_connection((PISUGAR_HOST, PISUGAR_PORT), timeout=0.3) as sock:
+        sock.sendall(b"GET /v1/battery HTTP/1.0\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n")
+        buf = b""
+        while b"\r\n\r\n" not in buf:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise ValueError("connection closed before headers")
+            buf += chunk
+        head, body = buf.split(b"\r\n\r\n", 1)
+        lines = head.decode("latin-1").split("\r\n")
+        if lines[0].split(" ", 2)[1:2] != ["200"]:
+            raise ValueError("unexpected status: %s" % lines[0])
+        length = None
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value.strip())
+        # without Content-Length the body runs until the server closes
+        while length is None or len(body) < length:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            body += chunk
+    return json.loads(body[:length].decode("utf-8", "ignore"))
+
 try:
-    out = subprocess.check_output(["curl", "-s", "http://127.0.0.1:8421/v1/battery"], timeout=1.0)
-    data = json.loads(out.decode("utf-8", "ignore"))
+    data = _get_battery()
     pct = int(data.get("percent", -1))
     chg = data.get("charging", False)
     s = f"PiSugar: {pct}%{' ⚡' if chg else ''}"
@@ -7,19 +7,26 @@ import os
 import json
 import time
 from datetime import datetime
-import subprocess
+import http.client
+from urllib.parse import urlsplit
 
 DEAUTH_FLAG = "/var/lib/pwnagotchi/deauth_enabled"
 DEAUTH_ALLOW = "/etc/pwnagotchi/allow_deauth"
 DEAUTH_TOKEN = "/etc/pwnagotchi/deauth_token"
 DEAUTH_LOG = "/var/log/pwnagotchi/deauth.log"
 AGENT_HTTP = "http://127.0.0.1:8422/deauth"  # must match plugin setting
+_AGENT = urlsplit(AGENT_HTTP)
+AGENT_TIMEOUT = 0.3
 
 def _audit(entry):
     try:
         os.makedirs(os.path.dirname(DEAUTH_LOG), exist_ok=True)
-        with open(DEAUTH_LOG, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        # single O_APPEND write so concurrent writers (plugin + script) never interleave
+        fd = os.open(DEAUTH_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+        try:
+            os.write(fd, (json.dumps(entry) + "\n").encode())
+        finally:
+            os.close(fd)
     except Exception:
         pass
 
@@ -29,10 +36,15 @@ def _notify_agent(action):
             return False
         token = open(DEAUTH_TOKEN).read().strip()
         payload = {"action": action, "token": token, "ts": time.time()}
-        subprocess.Popen(["curl", "-s", "-X", "POST", "-H", "Content-Type: application/json",
-                          "-d", json.dumps(payload), AGENT_HTTP],
-                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return True
+        conn = http.client.HTTPConnection(_AGENT.hostname, _AGENT.port, timeout=AGENT_TIMEOUT)
+        try:
+            conn.request("POST", _AGENT.path, body=json.dumps(payload),
+                         headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+        finally:
+            conn.close()
+        return 200 <= resp.status < 300
     except Exception:
         return False
 
@@ -49,14 +61,17 @@ def main():
     new = not current
     try:
         os.makedirs(os.path.dirname(DEAUTH_FLAG), exist_ok=True)
-        with open(DEAUTH_FLAG, "w") as f:
+        # write-then-rename so a reader never sees a half-written flag
+        tmp = DEAUTH_FLAG + ".tmp"
+        with open(tmp, "w") as f:
             f.write("1" if new else "0")
+        os.replace(tmp, DEAUTH_FLAG)
     except Exception:
         pass
 
     entry = {"ts": datetime.utcnow().isoformat()+"Z", "action": "arm" if new else "disarm", "method": "script"}
 
-    # If allow file present, try to notify the local agent (non-blocking)
+    # If allow file present, notify the local agent (blocks for at most AGENT_TIMEOUT per connect/read)
     if os.path.exists(DEAUTH_ALLOW):
         ok = _notify_agent("arm" if new else "disarm")
         entry["agent_notify"] = ok
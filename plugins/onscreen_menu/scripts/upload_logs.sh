@@ -1,5 +1,6 @@
 #!/usr/bin/env bash
 # upload_logs.sh (stub) - replace with rclone/scp/etc.
 echo "Uploading logs (stub)..."
-# Example (commented): rclone copy /var/log/pwnagotchi remote:backups/pwnagotchi
+# Example (commented): stream the archive straight to the remote, no temp tarball on SD
+# tar -czf - /var/log/pwnagotchi | rclone rcat "remote:backups/pwnagotchi/pwnalog-$(date +%Y%m%d-%H%M%S).tar.gz"
 exit 0